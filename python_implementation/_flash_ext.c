@@ -0,0 +1,61 @@
+/*
+ * C build of the binary flash kernel (flash_kernels._flash_binary).
+ *
+ * Optional fallback for environments without Numba. flash_ext.py loads the
+ * compiled library with ctypes when it sits next to this file:
+ *
+ *     cc -O3 -ffast-math -march=native -shared -fPIC -o _flash_ext.so _flash_ext.c -lm
+ *
+ * -ffast-math lets the compiler contract A - B/(T + C) into FMAs; results
+ * then differ from the Python kernel only in the last few ulps.
+ */
+
+#include <math.h>
+
+#ifdef _WIN32
+#define FLASH_EXPORT __declspec(dllexport)
+#else
+#define FLASH_EXPORT
+#endif
+
+/*
+ * Isothermal flash of a binary mixture.
+ *
+ * A and B are Antoine constants pre-scaled by ln(10), T is in Celsius and
+ * P in mmHg. On return out holds (K0, K1, psi, x0, x1, y0, y1).
+ */
+FLASH_EXPORT void flash_binary_c(double z0, double z1, double T, double P,
+                                 double A0, double B0, double C0,
+                                 double A1, double B1, double C1,
+                                 double out[7])
+{
+    const double inv_P = 1.0 / P;
+    const double K0 = exp(A0 - B0 / (T + C0)) * inv_P;
+    const double K1 = exp(A1 - B1 / (T + C1)) * inv_P;
+    const double a = K0 - 1.0;
+    const double b = K1 - 1.0;
+
+    /* Each z*(K - 1) term is shared by both bound residuals and the root */
+    const double za = z0 * a;
+    const double zb = z1 * b;
+    const double f_liquid = za + zb;
+    double psi;
+
+    /* Subcooled liquid or superheated vapor: the root lies outside [0, 1] */
+    if (f_liquid <= 0.0) {
+        psi = 0.0;
+    } else if (za / K0 + zb / K1 >= 0.0) {
+        psi = 1.0;
+    } else {
+        /* Closed-form binary Rachford-Rice root */
+        psi = -f_liquid / ((z0 + z1) * a * b);
+    }
+
+    out[0] = K0;
+    out[1] = K1;
+    out[2] = psi;
+    out[3] = z0 / (1.0 + psi * a);
+    out[4] = z1 / (1.0 + psi * b);
+    out[5] = K0 * out[3];
+    out[6] = K1 * out[4];
+}
@@ -8,27 +8,40 @@ Author: Generated for Distillation Repository
 Date: 2024
 """
 
+import argparse
+import functools
+import sys
+
 import numpy as np
-import matplotlib.pyplot as plt
 from flash_calculations import FlashCalculator, print_flash_results, sensitivity_analysis
 
 
-def benzene_toluene_example():
+# Benzene-toluene component data (Antoine constants), shared by the examples
+_BT_DATA = {
+    'benzene': {'A': 6.90565, 'B': 1211.033, 'C': 220.79},
+    'toluene': {'A': 6.95464, 'B': 1344.8, 'C': 219.482}
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _bt_calc():
+    # One benzene-toluene calculator for all examples, built on first use
+    return FlashCalculator(_BT_DATA)
+
+
+def benzene_toluene_example(plot=True):
     """
     Reproduce the benzene-toluene flash calculation from the theory section.
     This example matches the theoretical calculations in the README.
+    
+    Parameters:
+    plot (bool): Show the result plots; set False for non-interactive runs
     """
     print("BENZENE-TOLUENE FLASH CALCULATION EXAMPLE")
     print("=" * 50)
     
-    # Define component data (Antoine constants)
-    benzene_toluene_data = {
-        'benzene': {'A': 6.90565, 'B': 1211.033, 'C': 220.79},
-        'toluene': {'A': 6.95464, 'B': 1344.8, 'C': 219.482}
-    }
-    
-    # Create flash calculator
-    flash_calc = FlashCalculator(benzene_toluene_data)
+    # Benzene-toluene flash calculator
+    flash_calc = _bt_calc()
     
     # Perform flash calculation (conditions from theory example)
     results = flash_calc.binary_flash(
@@ -42,16 +55,22 @@ def benzene_toluene_example():
     print_flash_results(results)
     
     # Create visualization
-    fig = flash_calc.plot_flash_results(results)
-    plt.suptitle('Benzene-Toluene Flash Calculation Results', fontsize=16)
-    plt.show()
+    if plot:
+        import matplotlib.pyplot as plt
+        
+        fig = flash_calc.plot_flash_results(results)
+        plt.suptitle('Benzene-Toluene Flash Calculation Results', fontsize=16)
+        plt.show()
     
     return results
 
 
-def multicomponent_example():
+def multicomponent_example(plot=True):
     """
     Example flash calculation for a three-component hydrocarbon mixture.
+    
+    Parameters:
+    plot (bool): Show the result plots; set False for non-interactive runs
     """
     print("\nMULTI-COMPONENT FLASH CALCULATION EXAMPLE")
     print("=" * 50)
@@ -76,27 +95,28 @@ def multicomponent_example():
     print_flash_results(multi_results)
     
     # Create visualization
-    fig = multi_calc.plot_flash_results(multi_results)
-    plt.suptitle('Propane-Butane-Pentane Flash Calculation', fontsize=16)
-    plt.show()
+    if plot:
+        import matplotlib.pyplot as plt
+        
+        fig = multi_calc.plot_flash_results(multi_results)
+        plt.suptitle('Propane-Butane-Pentane Flash Calculation', fontsize=16)
+        plt.show()
     
     return multi_results
 
 
-def sensitivity_analysis_example():
+def sensitivity_analysis_example(plot=True):
     """
     Demonstrate sensitivity analysis for flash calculations.
+    
+    Parameters:
+    plot (bool): Show the result plots; set False for non-interactive runs
     """
     print("\nSENSITIVITY ANALYSIS EXAMPLE")
     print("=" * 40)
     
     # Use benzene-toluene system
-    benzene_toluene_data = {
-        'benzene': {'A': 6.90565, 'B': 1211.033, 'C': 220.79},
-        'toluene': {'A': 6.95464, 'B': 1344.8, 'C': 219.482}
-    }
-    
-    flash_calc = FlashCalculator(benzene_toluene_data)
+    flash_calc = _bt_calc()
     
     # Base case conditions
     base_case = {
@@ -116,6 +136,18 @@ def sensitivity_analysis_example():
     pressure_range = np.linspace(500, 1000, 20)
     pressure_sensitivity = sensitivity_analysis(flash_calc, base_case, 'P', pressure_range)
     
+    # Tabulate both sweeps, each formatted in a single pass
+    sys.stdout.write(f"\nTemperature sweep (P = {base_case['P']} mmHg):\n"
+                     + temp_sensitivity.as_dataframe().to_string(index=False, float_format='%.4f')
+                     + f"\n\nPressure sweep (T = {base_case['T']}°C):\n"
+                     + pressure_sensitivity.as_dataframe().to_string(index=False, float_format='%.4f')
+                     + "\n")
+    
+    if not plot:
+        return temp_sensitivity, pressure_sensitivity
+    
+    import matplotlib.pyplot as plt
+    
     # Plot results
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 10))
     
@@ -145,10 +177,13 @@ def sensitivity_analysis_example():
     ax4.set_title('Separation Factor vs Pressure')
     ax4.grid(True, alpha=0.3)
     
-    plt.suptitle('Flash Calculation Sensitivity Analysis', fontsize=16)
-    plt.tight_layout()
+    fig.suptitle('Flash Calculation Sensitivity Analysis', fontsize=16)
+    fig.tight_layout()
     plt.show()
     
+    # Release the figure so repeated runs do not accumulate open figures
+    plt.close(fig)
+    
     return temp_sensitivity, pressure_sensitivity
 
 
@@ -178,30 +213,28 @@ def industrial_example():
     print_flash_results(industrial_results)
     
     # Economic analysis
-    print("\nECONOMIC ANALYSIS:")
-    print(f"Light product recovery: {industrial_results['vapor_flow_molhr']:.1f} mol/hr "
-          f"({100*industrial_results['vapor_fraction']:.1f}% of feed)")
-    print(f"Heavy product: {industrial_results['liquid_flow_molhr']:.1f} mol/hr")
-    print(f"Light component purity in vapor: "
-          f"{100*industrial_results['vapor_composition']['light_naphtha']:.1f}%")
+    lines = [
+        "\nECONOMIC ANALYSIS:",
+        f"Light product recovery: {industrial_results['vapor_flow_molhr']:.1f} mol/hr "
+        f"({100*industrial_results['vapor_fraction']:.1f}% of feed)",
+        f"Heavy product: {industrial_results['liquid_flow_molhr']:.1f} mol/hr",
+        f"Light component purity in vapor: "
+        f"{100*industrial_results['vapor_composition']['light_naphtha']:.1f}%"
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return industrial_results
 
 
-def comparison_example():
+def comparison_example(plot=True):
     """
     Compare flash calculations at different operating conditions.
-    """
-    print("\nCOMPARISON OF OPERATING CONDITIONS")
-    print("=" * 45)
     
+    Parameters:
+    plot (bool): Show the result plots; set False for non-interactive runs
+    """
     # Benzene-toluene system
-    benzene_toluene_data = {
-        'benzene': {'A': 6.90565, 'B': 1211.033, 'C': 220.79},
-        'toluene': {'A': 6.95464, 'B': 1344.8, 'C': 219.482}
-    }
-    
-    flash_calc = FlashCalculator(benzene_toluene_data)
+    flash_calc = _bt_calc()
     
     # Different operating conditions
     conditions = [
@@ -212,33 +245,50 @@ def comparison_example():
         {'T': 100, 'P': 1000, 'name': 'High Pressure'}
     ]
     
-    results_comparison = []
+    # Only T and P vary, so all conditions are flashed as one batch
+    T = np.array([condition['T'] for condition in conditions], dtype=float)
+    P = np.array([condition['P'] for condition in conditions], dtype=float)
+    batch = flash_calc.binary_flash_batch(T, P, z_feed=[0.4, 0.6], F=100)
     
-    for condition in conditions:
-        result = flash_calc.binary_flash(
-            T=condition['T'],
-            P=condition['P'], 
-            z_feed=[0.4, 0.6],
-            F=100
-        )
-        
-        results_comparison.append({
+    ib = flash_calc.component_names.index('benzene')
+    x_benzene = batch['liquid_composition'][:, ib]
+    y_benzene = batch['vapor_composition'][:, ib]
+    benzene_recovery = batch['vapor_flow_molhr'] * y_benzene
+    separation_efficiency = y_benzene - x_benzene
+    
+    results_comparison = [
+        {
             'condition': condition['name'],
             'temperature': condition['T'],
             'pressure': condition['P'],
-            'vapor_fraction': result['vapor_fraction'],
-            'benzene_recovery': result['vapor_flow_molhr'] * result['vapor_composition']['benzene'],
-            'separation_efficiency': result['vapor_composition']['benzene'] - result['liquid_composition']['benzene']
-        })
+            'vapor_fraction': psi,
+            'benzene_recovery': recovery,
+            'separation_efficiency': efficiency
+        }
+        for condition, psi, recovery, efficiency in zip(
+            conditions, batch['vapor_fraction'].tolist(),
+            benzene_recovery.tolist(), separation_efficiency.tolist())
+    ]
+    
+    # Display the banner and comparison table in a single write
+    lines = [
+        "\nCOMPARISON OF OPERATING CONDITIONS",
+        "=" * 45,
+        f"{'Condition':<18} {'T(°C)':<6} {'P(mmHg)':<8} {'Vapor Frac':<11} {'Benzene Recovery':<15} {'Sep. Efficiency':<15}",
+        "-" * 85
+    ]
+    lines.extend(
+        f"{res['condition']:<18} {res['temperature']:<6.0f} {res['pressure']:<8.0f} "
+        f"{res['vapor_fraction']:<11.3f} {res['benzene_recovery']:<15.1f} "
+        f"{res['separation_efficiency']:<15.3f}"
+        for res in results_comparison
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
     
-    # Display comparison table
-    print(f"{'Condition':<18} {'T(°C)':<6} {'P(mmHg)':<8} {'Vapor Frac':<11} {'Benzene Recovery':<15} {'Sep. Efficiency':<15}")
-    print("-" * 85)
+    if not plot:
+        return results_comparison
     
-    for res in results_comparison:
-        print(f"{res['condition']:<18} {res['temperature']:<6.0f} {res['pressure']:<8.0f} "
-              f"{res['vapor_fraction']:<11.3f} {res['benzene_recovery']:<15.1f} "
-              f"{res['separation_efficiency']:<15.3f}")
+    import matplotlib.pyplot as plt
     
     # Visualization
     conditions_names = [res['condition'] for res in results_comparison]
@@ -262,26 +312,29 @@ def comparison_example():
     return results_comparison
 
 
-def main():
+def main(plot=True):
     """
     Run all example calculations.
+    
+    Parameters:
+    plot (bool): Show the result plots; set False for non-interactive runs
     """
-    print("FLASH CALCULATION EXAMPLES")
-    print("=" * 60)
-    print("This module demonstrates various flash calculation examples")
-    print("for binary and multi-component systems.\n")
+    sys.stdout.write("FLASH CALCULATION EXAMPLES\n"
+                     + "=" * 60 + "\n"
+                     "This module demonstrates various flash calculation examples\n"
+                     "for binary and multi-component systems.\n\n")
     
     try:
         # Run examples
-        benzene_results = benzene_toluene_example()
-        multi_results = multicomponent_example()
-        temp_sens, press_sens = sensitivity_analysis_example()
+        benzene_results = benzene_toluene_example(plot=plot)
+        multi_results = multicomponent_example(plot=plot)
+        temp_sens, press_sens = sensitivity_analysis_example(plot=plot)
         industrial_results = industrial_example()
-        comparison_results = comparison_example()
+        comparison_results = comparison_example(plot=plot)
         
-        print("\n" + "="*60)
-        print("ALL EXAMPLES COMPLETED SUCCESSFULLY!")
-        print("="*60)
+        sys.stdout.write("\n" + "="*60 + "\n"
+                         "ALL EXAMPLES COMPLETED SUCCESSFULLY!\n"
+                         + "="*60 + "\n")
         
         return {
             'benzene_toluene': benzene_results,
@@ -299,4 +352,9 @@ def main():
 
 
 if __name__ == "__main__":
-    results = main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the flash calculation examples.")
+    parser.add_argument('--no-plot', action='store_true',
+                        help="skip all plots (no matplotlib import or blocking windows)")
+    args = parser.parse_args()
+    
+    results = main(plot=not args.no_plot)
\ No newline at end of file
@@ -8,10 +8,27 @@ Author: Generated for Distillation Repository
 Date: 2024
 """
 
+import math
+import sys
+from dataclasses import dataclass
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.optimize import fsolve
-import pandas as pd
+
+import flash_kernels
+
+# 10**x == exp(x * ln 10); math.exp is cheaper than float.__pow__
+LN10 = math.log(10.0)
+
+# Module-level binding avoids the math attribute lookup in hot paths
+_exp = math.exp
+
+# Rachford-Rice solver defaults, shared by the NumPy and compiled solvers
+_RR_INITIAL_GUESS = 0.5
+_RR_TOLERANCE = 1e-12
+_RR_MAX_ITERATIONS = 50
+
+# Number of (T, P) conditions whose K-values each FlashCalculator keeps
+_K_CACHE_SIZE = 256
 
 
 def calculate_k_values(T, P, components):
@@ -27,17 +44,30 @@ def calculate_k_values(T, P, components):
     Returns:
     dict: K-values for each component
     """
-    K_values = {}
+    A = np.array([antoine['A'] for antoine in components.values()])
+    B = np.array([antoine['B'] for antoine in components.values()])
+    C = np.array([antoine['C'] for antoine in components.values()])
     
-    for component, antoine in components.items():
-        # Calculate vapor pressure using Antoine equation
-        A, B, C = antoine['A'], antoine['B'], antoine['C']
-        P_sat = 10**(A - B/(C + T))  # Vapor pressure in mmHg
-        
-        # Calculate K-value
-        K_values[component] = P_sat / P
+    return dict(zip(components, calculate_k_value_array(T, P, A, B, C).tolist()))
+
+
+def calculate_k_value_array(T, P, A, B, C):
+    """
+    Calculate K-values from per-parameter arrays of Antoine constants.
     
-    return K_values
+    Parameters:
+    T (float or array): Temperature in Celsius
+    P (float or array): Pressure in mmHg
+    A, B, C (array): Antoine constants, one entry per component
+    
+    Returns:
+    array: K-values for each component, broadcast against T and P
+    """
+    # Vapor pressure in mmHg; exp of the ln(10)-scaled exponent calls the
+    # vectorized exp loop directly instead of going through pow
+    P_sat = np.exp(LN10 * (A - B/(C + T)))
+    
+    return P_sat / P
 
 
 def rachford_rice_equation(psi, z, K):
@@ -55,7 +85,8 @@ def rachford_rice_equation(psi, z, K):
     return np.sum(z * (K - 1) / (1 + psi * (K - 1)))
 
 
-def solve_flash_calculation(z, K, initial_guess=0.5):
+def solve_flash_calculation(z, K, initial_guess=_RR_INITIAL_GUESS, tolerance=_RR_TOLERANCE,
+                            max_iterations=_RR_MAX_ITERATIONS):
     """
     Solve flash calculation using Rachford-Rice equation.
     
@@ -63,15 +94,56 @@ def solve_flash_calculation(z, K, initial_guess=0.5):
     z (array): Feed composition (mole fractions)
     K (array): K-values for each component
     initial_guess (float): Initial guess for vapor fraction
+    tolerance (float): Convergence tolerance on the vapor fraction
+    max_iterations (int): Maximum number of Newton iterations
     
     Returns:
     tuple: (vapor_fraction, liquid_composition, vapor_composition)
     """
-    # Solve for vapor fraction
-    psi_solution = fsolve(rachford_rice_equation, initial_guess, args=(z, K))[0]
-    
-    # Constrain vapor fraction between 0 and 1
-    psi = max(0, min(1, psi_solution))
+    # Subcooled liquid or superheated vapor: the root lies outside [0, 1]
+    f_liquid = rachford_rice_equation(0, z, K)
+    if f_liquid <= 0:
+        psi = 0.0
+    elif rachford_rice_equation(1, z, K) >= 0:
+        psi = 1.0
+    elif len(z) == 2:
+        # Binary mixtures: clearing both denominators leaves an equation
+        # linear in psi, so the root is available in closed form; its
+        # numerator is the residual at psi = 0. The checks above bracket it
+        # inside (0, 1), so no clamping is needed.
+        psi = -f_liquid / ((z[0] + z[1]) * (K[0] - 1) * (K[1] - 1))
+    else:
+        # Newton iteration on the Rachford-Rice equation. The residual
+        # decreases monotonically between its poles, so each evaluation
+        # tightens the bracket [lo, hi] (initially [0, 1], which is what the
+        # Whitson bounds reduce to once both single-phase checks have failed)
+        # and steps leaving it fall back to bisection.
+        K_minus_1 = K - 1
+        lo, hi = 0.0, 1.0
+        psi = initial_guess if 0 < initial_guess < 1 else 0.5
+        
+        for _ in range(max_iterations):
+            denom = 1 + psi * K_minus_1
+            terms = z * K_minus_1 / denom
+            f = np.sum(terms)
+            df = -np.sum(terms * K_minus_1 / denom)
+            
+            if f > 0:
+                lo = psi
+            else:
+                hi = psi
+            
+            psi_new = psi - f / df
+            if not lo < psi_new < hi:
+                psi_new = 0.5 * (lo + hi)
+            
+            converged = abs(psi_new - psi) < tolerance
+            psi = psi_new
+            if converged:
+                break
+        else:
+            # Out of iterations: finish on the bracket Newton has narrowed
+            psi = _rr_brentq(z, K, lo, hi, tolerance)
     
     # Calculate liquid and vapor compositions
     x = z / (1 + psi * (K - 1))  # Liquid composition
@@ -80,6 +152,116 @@ def solve_flash_calculation(z, K, initial_guess=0.5):
     return psi, x, y
 
 
+def _rr_brentq(z, K, lo, hi, tolerance=_RR_TOLERANCE):
+    """
+    Fallback Rachford-Rice solve with Brent's method.
+    
+    Used when a Newton iteration exhausts its iterations. [lo, hi] must
+    bracket the root, which holds for [0, 1] whenever both single-phase
+    checks have failed, and for any bracket a Newton iteration narrowed.
+    
+    Returns:
+    float: Vapor fraction
+    """
+    from scipy.optimize import brentq
+    
+    return brentq(rachford_rice_equation, lo, hi, args=(z, K), xtol=tolerance)
+
+
+def _rr_newton_batch(z, K, active, tolerance=_RR_TOLERANCE, max_iterations=_RR_MAX_ITERATIONS):
+    """
+    Safeguarded Newton iteration on the Rachford-Rice equation for a batch.
+    
+    Every sample is updated with the same array operations. Converged samples
+    are frozen by the active mask, and steps that leave a sample's current
+    bracket fall back to bisection, so no per-sample branching or clamping
+    is needed. Samples left unconverged after max_iterations are finished
+    with Brent's method, as in solve_flash_calculation.
+    
+    Parameters:
+    z (array): Feed compositions, shape (n_samples, n_components)
+    K (array): K-values, shape (n_samples, n_components)
+    active (array): Boolean mask of samples with a root inside (0, 1)
+    tolerance (float): Convergence tolerance on psi
+    max_iterations (int): Maximum number of Newton iterations
+    
+    Returns:
+    array: Vapor fractions (only meaningful where active was set)
+    """
+    n = K.shape[0]
+    K_minus_1 = K - 1
+    psi = np.full(n, 0.5)
+    lo, hi = np.zeros(n), np.ones(n)
+    active = active.copy()
+    
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+        
+        denom = 1 + psi[:, None] * K_minus_1
+        f = np.sum(z * K_minus_1 / denom, axis=1)
+        df = -np.sum(z * K_minus_1**2 / denom**2, axis=1)
+        
+        # The residual decreases monotonically in psi, so its sign
+        # tightens the bracket around the root
+        lo = np.where(f > 0, psi, lo)
+        hi = np.where(f < 0, psi, hi)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            psi_new = psi - f / df
+        psi_new = np.where((psi_new > lo) & (psi_new < hi), psi_new, 0.5 * (lo + hi))
+        psi_new = np.where(active, psi_new, psi)
+        
+        active &= np.abs(psi_new - psi) >= tolerance
+        psi = psi_new
+    
+    # Samples still unconverged get the same fallback as the scalar solver,
+    # on the bracket Newton has narrowed for each
+    for i in np.flatnonzero(active):
+        psi[i] = _rr_brentq(z[i], K[i], lo[i], hi[i], tolerance)
+    
+    return psi
+
+
+def solve_flash_batch(z, K):
+    """
+    Solve a batch of flash calculations in one vectorized pass.
+    
+    Binary mixtures use the closed-form root; larger mixtures use a masked,
+    safeguarded Newton iteration over the whole batch.
+    
+    Parameters:
+    z (array): Feed composition, shape (n_components,) or (n_samples, n_components)
+    K (array): K-values, shape (n_samples, n_components)
+    
+    Returns:
+    tuple: (vapor_fractions, liquid_compositions, vapor_compositions)
+    """
+    K = np.asarray(K, dtype=float)
+    z = np.broadcast_to(np.asarray(z, dtype=float), K.shape)
+    
+    # Residuals at the bounds identify subcooled and superheated samples
+    f_liquid = np.sum(z * (K - 1), axis=1)
+    f_vapor = np.sum(z * (K - 1) / K, axis=1)
+    
+    if K.shape[1] == 2:
+        # Closed-form binary root, evaluated for every sample at once; it lies
+        # inside (0, 1) wherever it is selected below
+        a, b = K[:, 0] - 1, K[:, 1] - 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            psi_solution = -f_liquid / (np.sum(z, axis=1) * a * b)
+    else:
+        psi_solution = _rr_newton_batch(z, K, (f_liquid > 0) & (f_vapor < 0))
+    
+    psi = np.where(f_liquid <= 0, 0.0, np.where(f_vapor >= 0, 1.0, psi_solution))
+    
+    # Calculate liquid and vapor compositions
+    x = z / (1 + psi[:, None] * (K - 1))  # Liquid composition
+    y = K * x  # Vapor composition
+    
+    return psi, x, y
+
+
 def flash_unit_material_balance(F, z, psi, x, y):
     """
     Verify material balance around flash unit.
@@ -101,24 +283,88 @@ def flash_unit_material_balance(F, z, psi, x, y):
     overall_balance = abs(F - (V + L))
     
     # Component material balance check
-    component_balance = []
-    for i in range(len(z)):
-        balance_error = abs(F * z[i] - (V * y[i] + L * x[i]))
-        component_balance.append(balance_error)
+    component_balance = np.abs(F * np.asarray(z) - (V * np.asarray(y) + L * np.asarray(x)))
     
     return {
         'vapor_flow': V,
         'liquid_flow': L,
         'overall_balance_error': overall_balance,
-        'component_balance_errors': np.array(component_balance)
+        'component_balance_errors': component_balance
     }
 
 
+@dataclass(frozen=True, eq=False)
+class FlashResult:
+    """
+    Flat, lightweight results of a single flash calculation.
+    
+    Composition and K-value arrays follow the order of component_names.
+    Use as_legacy_dict() for the nested dict returned by binary_flash.
+    Results compare and hash by identity, since their fields are arrays.
+    """
+    # Declared by hand rather than with dataclass(slots=True), which needs
+    # Python 3.10
+    __slots__ = ('component_names', 'temperature_C', 'pressure_mmHg',
+                 'feed_composition', 'K_values', 'vapor_fraction',
+                 'liquid_composition', 'vapor_composition', 'feed_flow_molhr')
+    
+    component_names: tuple
+    temperature_C: float
+    pressure_mmHg: float
+    feed_composition: np.ndarray
+    K_values: np.ndarray
+    vapor_fraction: float
+    liquid_composition: np.ndarray
+    vapor_composition: np.ndarray
+    feed_flow_molhr: float
+    
+    @property
+    def vapor_flow_molhr(self):
+        return self.vapor_fraction * self.feed_flow_molhr
+    
+    @property
+    def liquid_flow_molhr(self):
+        return self.feed_flow_molhr - self.vapor_flow_molhr
+    
+    def as_legacy_dict(self):
+        """
+        Convert to the nested results dict, including the material balance check.
+        
+        Returns:
+        dict: Complete flash calculation results
+        """
+        names = self.component_names
+        balance = flash_unit_material_balance(
+            self.feed_flow_molhr, self.feed_composition, self.vapor_fraction,
+            self.liquid_composition, self.vapor_composition)
+        
+        return {
+            'temperature_C': self.temperature_C,
+            'pressure_mmHg': self.pressure_mmHg,
+            'feed_composition': dict(zip(names, self.feed_composition)),
+            'K_values': dict(zip(names, self.K_values)),
+            'vapor_fraction': self.vapor_fraction,
+            'liquid_composition': dict(zip(names, self.liquid_composition)),
+            'vapor_composition': dict(zip(names, self.vapor_composition)),
+            'feed_flow_molhr': self.feed_flow_molhr,
+            'vapor_flow_molhr': balance['vapor_flow'],
+            'liquid_flow_molhr': balance['liquid_flow'],
+            'material_balance_check': {
+                'overall_error': balance['overall_balance_error'],
+                'component_errors': dict(zip(names, balance['component_balance_errors']))
+            }
+        }
+
+
 class FlashCalculator:
     """
     A comprehensive flash calculation class for binary and multi-component systems.
     """
     
+    # Scalar kernel for binary feeds; flash_numba swaps in a jitted version
+    # and flash_ext the optional C build
+    _flash_binary = staticmethod(flash_kernels._flash_binary)
+    
     def __init__(self, components_data):
         """
         Initialize flash calculator with component data.
@@ -128,6 +374,68 @@ class FlashCalculator:
         """
         self.components_data = components_data
         self.component_names = list(components_data.keys())
+        self._names = tuple(self.component_names)
+        
+        # Antoine constants stored per parameter as arrays indexed by
+        # component ordinal
+        self.A = np.array([data['A'] for data in components_data.values()], dtype=np.float64)
+        self.B = np.array([data['B'] for data in components_data.values()], dtype=np.float64)
+        self.C = np.array([data['C'] for data in components_data.values()], dtype=np.float64)
+        
+        # A and B pre-scaled by ln(10), so vapor pressures come from
+        # exp(A_ln - B_ln/(C + T)); C needs no scaling
+        self._A_ln = self.A * LN10
+        self._B_ln = self.B * LN10
+        
+        # Argument pack (A0_ln, B0_ln, C0, A1_ln, B1_ln, C1) for the binary
+        # kernels, as Python floats since the pure-Python kernel is markedly
+        # slower on NumPy scalars; None unless the system is binary
+        self._binary_antoine = None
+        if len(self._names) == 2:
+            self._binary_antoine = tuple(
+                np.column_stack((self._A_ln, self._B_ln, self.C)).ravel().tolist())
+        
+        # Memoized K-value vectors for repeated (T, P) conditions; a plain
+        # dict, so the cache holds no reference back to the calculator
+        self._k_cache = {}
+    
+    def vapor_pressure(self, component, T):
+        """
+        Calculate vapor pressure of a component using the Antoine equation.
+        
+        Parameters:
+        component (str): Component name
+        T (float): Temperature in Celsius
+        
+        Returns:
+        float: Vapor pressure in mmHg
+        """
+        return self._vapor_pressure(self.component_names.index(component), T)
+    
+    def _vapor_pressure(self, i, T):
+        return _exp(self._A_ln[i] - self._B_ln[i]/(self.C[i] + float(T)))
+    
+    def _k(self, T, inv_P):
+        # K-values for every component at once; T and inv_P broadcast, so a
+        # column of temperatures yields one row of K-values per sample
+        return np.exp(self._A_ln - self._B_ln/(self.C + T)) * inv_P
+    
+    def _k_at(self, T, P):
+        # K-values at scalar (T, P), memoized in _k_cache. Dicts keep
+        # insertion order, so re-inserting on a hit keeps the first key the
+        # least recently used.
+        key = (float(T), float(P))
+        K = self._k_cache.pop(key, None)
+        if K is None:
+            if len(self._k_cache) >= _K_CACHE_SIZE:
+                # Evict the least recently used entry
+                del self._k_cache[next(iter(self._k_cache))]
+            
+            # Cached values are shared between calls, so hand them out read-only
+            K = self._k(key[0], 1.0 / key[1])
+            K.setflags(write=False)
+        self._k_cache[key] = K
+        return K
     
     def binary_flash(self, T, P, z_feed, F=100):
         """
@@ -142,44 +450,125 @@ class FlashCalculator:
         Returns:
         dict: Complete flash calculation results
         """
+        return self.flash(T, P, z_feed, F).as_legacy_dict()
+    
+    def flash(self, T, P, z_feed, F=100):
+        """
+        Perform flash calculation, returning a lightweight FlashResult.
+        
+        Skips the nested results dict and material balance check that
+        binary_flash builds, which dominate the cost of a single flash in
+        parameter sweeps.
+        
+        Parameters:
+        T (float): Temperature in Celsius
+        P (float): Pressure in mmHg
+        z_feed (list): Feed composition (mole fractions)
+        F (float): Feed flow rate (mol/hr)
+        
+        Returns:
+        FlashResult: Flash calculation results
+        """
+        # Copied so the result does not alias the caller's feed array
+        z = np.array(z_feed, dtype=np.float64)
+        if z.shape != (len(self._names),):
+            raise ValueError(f"expected a feed composition of {len(self._names)} mole "
+                             f"fractions, got shape {z.shape}")
+        
+        if self._binary_antoine is not None:
+            # Binary feeds run entirely inside the scalar kernel
+            K0, K1, psi, x0, x1, y0, y1 = self._flash_binary(
+                float(z[0]), float(z[1]), float(T), float(P), *self._binary_antoine)
+            K = np.array([K0, K1])
+            x = np.array([x0, x1])
+            y = np.array([y0, y1])
+        else:
+            K, psi, x, y = self._flash_multicomponent(T, P, z)
+        
+        return FlashResult(self._names, T, P, z, K, psi, x, y, F)
+    
+    def _flash_multicomponent(self, T, P, z):
+        """
+        K-values and flash solution for a feed of three or more components.
+        
+        Returns:
+        tuple: (K_values, vapor_fraction, liquid_composition, vapor_composition)
+        """
         # Calculate K-values
-        K_values = calculate_k_values(T, P, self.components_data)
-        K = np.array([K_values[comp] for comp in self.component_names])
-        z = np.array(z_feed)
+        K = self._k_at(T, P)
         
         # Solve flash calculation
         psi, x, y = solve_flash_calculation(z, K)
         
-        # Material balance verification
-        balance = flash_unit_material_balance(F, z, psi, x, y)
+        return K, psi, x, y
+    
+    def binary_flash_batch(self, T, P, z_feed, F=100):
+        """
+        Perform flash calculations over arrays of conditions in one batch.
+        
+        Parameters:
+        T (float or array): Temperature(s) in Celsius, of any shape
+        P (float or array): Pressure(s) in mmHg, broadcast against T
+        z_feed (array): Feed composition, either one composition shared by all
+                        samples or one per sample along the last axis
+        F (float or array): Feed flow rate(s) (mol/hr), broadcast against the samples
+        
+        Returns:
+        dict: Flash results as arrays shaped like the broadcast samples, e.g.
+              a T x P meshgrid; composition and K-value arrays add a last axis
+              in the order of component_names
+        """
+        z = np.asarray(z_feed, dtype=float)
+        T = np.atleast_1d(np.asarray(T, dtype=float))
+        P = np.atleast_1d(np.asarray(P, dtype=float))
+        shape = np.broadcast_shapes(T.shape, P.shape, z.shape[:-1])
+        T, P = np.broadcast_to(T, shape), np.broadcast_to(P, shape)
         
-        # Prepare results
-        results = {
+        # The solvers work on a flat list of samples; a shared composition
+        # stays 1-D so the compiled binary sweep can use it directly
+        n = z.shape[-1]
+        if z.ndim > 1:
+            z = np.broadcast_to(z, shape + (n,)).reshape(-1, n)
+        K, psi, x, y = self._binary_flash_arrays(T.ravel(), P.ravel(), z)
+        K, x, y = (arr.reshape(shape + (n,)) for arr in (K, x, y))
+        psi = psi.reshape(shape)
+        
+        return {
             'temperature_C': T,
             'pressure_mmHg': P,
-            'feed_composition': dict(zip(self.component_names, z)),
-            'K_values': K_values,
+            'K_values': K,
             'vapor_fraction': psi,
-            'liquid_composition': dict(zip(self.component_names, x)),
-            'vapor_composition': dict(zip(self.component_names, y)),
+            'liquid_composition': x,
+            'vapor_composition': y,
             'feed_flow_molhr': F,
-            'vapor_flow_molhr': balance['vapor_flow'],
-            'liquid_flow_molhr': balance['liquid_flow'],
-            'material_balance_check': {
-                'overall_error': balance['overall_balance_error'],
-                'component_errors': dict(zip(self.component_names, balance['component_balance_errors']))
-            }
+            'vapor_flow_molhr': psi * F,
+            'liquid_flow_molhr': F - psi * F
         }
+    
+    def _binary_flash_arrays(self, T, P, z_feed):
+        # Vectorized core of binary_flash_batch; flash_numba overrides it
+        # with a parallel compiled loop
+        K = self._k(T[:, None], (1.0 / P)[:, None])
         
-        return results
+        psi, x, y = solve_flash_batch(z_feed, K)
+        return K, psi, x, y
     
-    def plot_flash_results(self, results):
+    def plot_flash_results(self, results, plot=True):
         """
         Create visualization of flash calculation results.
         
         Parameters:
         results (dict): Results from flash calculation
+        plot (bool): If False, skip plotting (and the matplotlib import) entirely
+        
+        Returns:
+        Figure: The matplotlib figure, or None when plot is False
         """
+        if not plot:
+            return None
+        
+        import matplotlib.pyplot as plt
+        
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 10))
         
         components = list(results['feed_composition'].keys())
@@ -241,45 +630,59 @@ class FlashCalculator:
         return fig
 
 
-def print_flash_results(results):
+def print_flash_results(results, verbose=True):
     """
     Print formatted flash calculation results.
     
     Parameters:
     results (dict): Results from flash calculation
+    verbose (bool): Include the per-component K-value, composition and
+                    material balance sections; False prints only the
+                    conditions and flow rates
     """
-    print("="*60)
-    print("FLASH CALCULATION RESULTS")
-    print("="*60)
-    print(f"Temperature: {results['temperature_C']:.1f}°C")
-    print(f"Pressure: {results['pressure_mmHg']:.0f} mmHg")
-    print()
-    
-    print("K-VALUES:")
-    for comp, k_val in results['K_values'].items():
-        print(f"  {comp}: {k_val:.2f}")
-    print()
-    
-    print("COMPOSITIONS (mole fraction):")
-    print(f"{'Component':<12} {'Feed':<8} {'Liquid':<8} {'Vapor':<8}")
-    print("-" * 40)
-    for comp in results['feed_composition'].keys():
-        print(f"{comp:<12} {results['feed_composition'][comp]:<8.3f} "
-              f"{results['liquid_composition'][comp]:<8.3f} "
-              f"{results['vapor_composition'][comp]:<8.3f}")
-    print()
-    
-    print("FLOW RATES:")
-    print(f"  Feed: {results['feed_flow_molhr']:.1f} mol/hr")
-    print(f"  Vapor: {results['vapor_flow_molhr']:.1f} mol/hr")
-    print(f"  Liquid: {results['liquid_flow_molhr']:.1f} mol/hr")
-    print(f"  Vapor fraction: {results['vapor_fraction']:.1%}")
-    print()
-    
-    print("MATERIAL BALANCE CHECK:")
-    print(f"  Overall balance error: {results['material_balance_check']['overall_error']:.2e}")
-    for comp, error in results['material_balance_check']['component_errors'].items():
-        print(f"  {comp} balance error: {error:.2e}")
+    lines = [
+        "=" * 60,
+        "FLASH CALCULATION RESULTS",
+        "=" * 60,
+        f"Temperature: {results['temperature_C']:.1f}°C",
+        f"Pressure: {results['pressure_mmHg']:.0f} mmHg",
+        ""
+    ]
+    
+    if verbose:
+        lines.append("K-VALUES:")
+        lines.extend(f"  {comp}: {k_val:.2f}" for comp, k_val in results['K_values'].items())
+        lines.append("")
+        
+        lines.append("COMPOSITIONS (mole fraction):")
+        lines.append(f"{'Component':<12} {'Feed':<8} {'Liquid':<8} {'Vapor':<8}")
+        lines.append("-" * 40)
+        lines.extend(
+            f"{comp:<12} {results['feed_composition'][comp]:<8.3f} "
+            f"{results['liquid_composition'][comp]:<8.3f} "
+            f"{results['vapor_composition'][comp]:<8.3f}"
+            for comp in results['feed_composition']
+        )
+        lines.append("")
+    
+    lines.extend([
+        "FLOW RATES:",
+        f"  Feed: {results['feed_flow_molhr']:.1f} mol/hr",
+        f"  Vapor: {results['vapor_flow_molhr']:.1f} mol/hr",
+        f"  Liquid: {results['liquid_flow_molhr']:.1f} mol/hr",
+        f"  Vapor fraction: {results['vapor_fraction']:.1%}"
+    ])
+    
+    if verbose:
+        balance = results['material_balance_check']
+        lines.append("")
+        lines.append("MATERIAL BALANCE CHECK:")
+        lines.append(f"  Overall balance error: {balance['overall_error']:.2e}")
+        lines.extend(f"  {comp} balance error: {error:.2e}"
+                     for comp, error in balance['component_errors'].items())
+    
+    # Emit the whole report in a single write
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def antoine_with_pressure_correction(T, P, A, B, C, omega=0):
@@ -289,20 +692,20 @@ def antoine_with_pressure_correction(T, P, A, B, C, omega=0):
     Parameters:
     T (float): Temperature in Celsius
     P (float): System pressure in mmHg
-    A, B, C (float): Antoine constants
-    omega (float): Acentric factor for pressure correction
+    A, B, C (float or array): Antoine constants, scalars or one entry per component
+    omega (float or array): Acentric factor for pressure correction
     
     Returns:
-    float: Corrected vapor pressure
+    float or array: Corrected vapor pressure
     """
-    P_sat = 10**(A - B/(C + T))
+    P_sat = np.exp(LN10 * (A - B/(C + T)))
     
-    # Pressure correction factor (simplified)
-    if omega > 0:
-        correction = 1 + omega * (P / P_sat - 1) * 0.1
-        P_sat *= correction
+    # Pressure correction factor (simplified), applied per component where
+    # an acentric factor is given
+    omega = np.asarray(omega)
+    correction = np.where(omega > 0, 1 + omega * (P / P_sat - 1) * 0.1, 1.0)
     
-    return P_sat
+    return P_sat * correction
 
 
 def flash_with_activity_coefficients(z, K, gamma_L=None, phi_V=None):
@@ -318,56 +721,90 @@ def flash_with_activity_coefficients(z, K, gamma_L=None, phi_V=None):
     Returns:
     tuple: (vapor_fraction, liquid_composition, vapor_composition)
     """
-    if gamma_L is None:
-        gamma_L = np.ones_like(z)
-    if phi_V is None:
-        phi_V = np.ones_like(z)
+    z = np.asarray(z, dtype=np.float64)
     
-    # Modified K-values for non-ideal behavior
-    K_modified = K * gamma_L / phi_V
+    # Modified K-values for non-ideal behavior; ideal defaults leave K as is
+    K_modified = np.asarray(K, dtype=np.float64)
+    if gamma_L is not None:
+        K_modified = K_modified * gamma_L
+    if phi_V is not None:
+        K_modified = K_modified / phi_V
     
     return solve_flash_calculation(z, K_modified)
 
 
+class SensitivityResults(dict):
+    """
+    Sensitivity analysis results as a dict of column name to NumPy array.
+    """
+    
+    def as_dataframe(self):
+        """
+        Convert the results to a pandas DataFrame, one row per parameter value.
+        
+        Returns:
+        pandas.DataFrame: The results table
+        """
+        import pandas as pd
+        
+        return pd.DataFrame(self)
+
+
 def sensitivity_analysis(flash_calculator, base_conditions, parameter, range_values):
     """
     Perform sensitivity analysis on flash calculation parameters.
     
     Parameters:
     flash_calculator: FlashCalculator instance
-    base_conditions (dict): Base case conditions
+    base_conditions (dict): Base case conditions: 'T', 'P', 'z_feed' and optionally 'F'
     parameter (str): Parameter to vary ('T', 'P', or composition)
     range_values (array): Range of values to test
     
     Returns:
-    pandas.DataFrame: Results for each parameter value
+    SensitivityResults: Dict of result arrays, one entry per parameter value
     """
-    results_list = []
-    
-    for value in range_values:
-        conditions = base_conditions.copy()
-        
-        if parameter == 'T':
-            conditions['T'] = value
-        elif parameter == 'P':
-            conditions['P'] = value
-        elif parameter.startswith('z_'):
-            # Modify composition while maintaining closure
-            comp_index = int(parameter.split('_')[1])
-            conditions['z_feed'][comp_index] = value
-            conditions['z_feed'][1-comp_index] = 1 - value
-        
-        result = flash_calculator.binary_flash(**conditions)
-        
-        results_list.append({
-            parameter: value,
-            'vapor_fraction': result['vapor_fraction'],
-            'benzene_liquid': result['liquid_composition'].get('benzene', 0),
-            'benzene_vapor': result['vapor_composition'].get('benzene', 0),
-            'separation_factor': calculate_separation_factor(result)
-        })
-    
-    return pd.DataFrame(results_list)
+    values = np.asarray(range_values, dtype=float)
+    T = np.broadcast_to(np.asarray(base_conditions['T'], dtype=float), values.shape)
+    P = np.broadcast_to(np.asarray(base_conditions['P'], dtype=float), values.shape)
+    z = np.tile(np.asarray(base_conditions['z_feed'], dtype=float), (len(values), 1))
+    
+    if parameter == 'T':
+        T = values
+    elif parameter == 'P':
+        P = values
+    elif parameter.startswith('z_'):
+        # Modify composition while maintaining closure
+        comp_index = int(parameter.split('_')[1])
+        z[:, comp_index] = values
+        z[:, 1-comp_index] = 1 - values
+    
+    # The whole sweep is flashed as one batch rather than point by point
+    batch = flash_calculator.binary_flash_batch(T, P, z, F=base_conditions.get('F', 100))
+    
+    x, y = batch['liquid_composition'], batch['vapor_composition']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        separation_factor = np.where((x[:, 0] > 0) & (x[:, 1] > 0), _sep_factor(x, y), 1.0)
+    
+    names = flash_calculator.component_names
+    if 'benzene' in names:
+        benzene_liquid = x[:, names.index('benzene')]
+        benzene_vapor = y[:, names.index('benzene')]
+    else:
+        benzene_liquid = benzene_vapor = np.zeros(len(values))
+    
+    return SensitivityResults({
+        parameter: values,
+        'vapor_fraction': batch['vapor_fraction'],
+        'benzene_liquid': benzene_liquid,
+        'benzene_vapor': benzene_vapor,
+        'separation_factor': separation_factor
+    })
+
+
+def _sep_factor(x, y):
+    # Relative volatility of the first two components, (y0/x0) / (y1/x1),
+    # broadcast over any leading sample axes
+    return (y[..., 0] * x[..., 1]) / (y[..., 1] * x[..., 0])
 
 
 def calculate_separation_factor(results):
@@ -380,15 +817,14 @@ def calculate_separation_factor(results):
     Returns:
     float: Separation factor
     """
-    components = list(results['vapor_composition'].keys())
-    if len(components) >= 2:
-        comp1, comp2 = components[0], components[1]
-        y1, y2 = results['vapor_composition'][comp1], results['vapor_composition'][comp2]
-        x1, x2 = results['liquid_composition'][comp1], results['liquid_composition'][comp2]
-        
-        if x1 > 0 and x2 > 0:
-            return (y1/x1) / (y2/x2)
-    return 1.0
+    x = np.fromiter(results['liquid_composition'].values(), dtype=np.float64)
+    y = np.fromiter(results['vapor_composition'].values(), dtype=np.float64)
+    
+    if len(x) < 2:
+        return 1.0
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.where((x[0] > 0) & (x[1] > 0), _sep_factor(x, y), 1.0))
 
 
 def process_stream_flash(stream_data, flash_conditions):
@@ -408,28 +844,97 @@ def process_stream_flash(stream_data, flash_conditions):
     
     # Perform flash calculation
     flash_calc = FlashCalculator(stream_data['component_data'])
-    results = flash_calc.binary_flash(
+    result = flash_calc.flash(
         T=flash_conditions['temperature'],
         P=flash_conditions['pressure'],
         z_feed=list(composition.values()),
         F=flow_rate
     )
     
-    # Create output streams
+    # Create output streams; compositions are repacked into dicts only here
     vapor_stream = {
-        'flow_rate': results['vapor_flow_molhr'],
-        'composition': results['vapor_composition'],
+        'flow_rate': result.vapor_flow_molhr,
+        'composition': dict(zip(result.component_names, result.vapor_composition)),
         'temperature': flash_conditions['temperature'],
         'pressure': flash_conditions['pressure'],
         'phase': 'vapor'
     }
     
     liquid_stream = {
-        'flow_rate': results['liquid_flow_molhr'],
-        'composition': results['liquid_composition'],
+        'flow_rate': result.liquid_flow_molhr,
+        'composition': dict(zip(result.component_names, result.liquid_composition)),
         'temperature': flash_conditions['temperature'],
         'pressure': flash_conditions['pressure'],
         'phase': 'liquid'
     }
     
-    return {'vapor': vapor_stream, 'liquid': liquid_stream}
\ No newline at end of file
+    return {'vapor': vapor_stream, 'liquid': liquid_stream}
+
+
+def process_streams_batch(streams, conditions):
+    """
+    Flash a batch of process streams in one vectorized calculation.
+    
+    All streams must share the same component set, taken from the first
+    stream's component data.
+    
+    Parameters:
+    streams (list): Process stream dicts, as accepted by process_stream_flash
+    conditions (dict or list): Flash operating conditions, either one dict
+                               shared by all streams or one dict per stream
+    
+    Returns:
+    list: Updated stream data with vapor and liquid outlets, one per stream
+    """
+    if not streams:
+        raise ValueError("expected at least one stream")
+    if isinstance(conditions, dict):
+        conditions = [conditions]
+    if len(conditions) not in (1, len(streams)):
+        raise ValueError(f"expected 1 or {len(streams)} flash conditions for "
+                         f"{len(streams)} streams, got {len(conditions)}")
+    if len(conditions) == 1:
+        conditions = conditions * len(streams)
+    
+    # Compositions are stacked positionally, so every stream must list the
+    # components in the order of the shared component data
+    flash_calc = FlashCalculator(streams[0]['component_data'])
+    names = flash_calc.component_names
+    for i, stream in enumerate(streams):
+        if list(stream['composition']) != names:
+            raise ValueError(f"stream {i} composition keys {list(stream['composition'])} "
+                             f"do not match component data {names}")
+    
+    # Stack compositions into a (streams, components) matrix
+    z = np.array([list(stream['composition'].values()) for stream in streams], dtype=np.float64)
+    F = np.array([stream['flow_rate'] for stream in streams], dtype=np.float64)
+    T = np.array([condition['temperature'] for condition in conditions], dtype=np.float64)
+    P = np.array([condition['pressure'] for condition in conditions], dtype=np.float64)
+    
+    results = flash_calc.binary_flash_batch(T, P, z, F)
+    
+    # Build output stream dicts only once the whole batch is solved, with the
+    # same value types as process_stream_flash
+    vapor_flow = results['vapor_flow_molhr'].tolist()
+    liquid_flow = results['liquid_flow_molhr'].tolist()
+    outlets = []
+    for i, condition in enumerate(conditions):
+        vapor_stream = {
+            'flow_rate': vapor_flow[i],
+            'composition': dict(zip(names, results['vapor_composition'][i])),
+            'temperature': condition['temperature'],
+            'pressure': condition['pressure'],
+            'phase': 'vapor'
+        }
+        
+        liquid_stream = {
+            'flow_rate': liquid_flow[i],
+            'composition': dict(zip(names, results['liquid_composition'][i])),
+            'temperature': condition['temperature'],
+            'pressure': condition['pressure'],
+            'phase': 'liquid'
+        }
+        
+        outlets.append({'vapor': vapor_stream, 'liquid': liquid_stream})
+    
+    return outlets
@@ -0,0 +1,66 @@
+"""
+Optional C Extension for Flash Calculations
+
+Loads the C build of the binary flash kernel (_flash_ext.c) through ctypes
+when the compiled library is present next to this file; flash_binary is None
+when it has not been built.
+
+The C kernel is opt-in through this module's FlashCalculator and is not used
+by flash_calculations: the ctypes call overhead (argument packing, the output
+buffer and the result tuple) costs more than the arithmetic it replaces, so
+per-call it is slower than the pure-Python kernel.
+
+Author: Generated for Distillation Repository
+Date: 2024
+"""
+
+import ctypes
+import os
+
+import flash_calculations
+
+_LIBRARY_NAME = '_flash_ext.dll' if os.name == 'nt' else '_flash_ext.so'
+
+
+def _load_flash_binary():
+    """
+    Load flash_binary_c from the compiled library.
+    
+    Returns:
+    callable or None: Wrapper with the signature of flash_kernels._flash_binary
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), _LIBRARY_NAME)
+    try:
+        library = ctypes.CDLL(path)
+    except OSError:
+        return None
+    
+    c_flash_binary = library.flash_binary_c
+    c_flash_binary.argtypes = [ctypes.c_double] * 10 + [ctypes.POINTER(ctypes.c_double)]
+    c_flash_binary.restype = None
+    result_type = ctypes.c_double * 7
+    
+    def flash_binary(z0, z1, T, P, A0, B0, C0, A1, B1, C1):
+        out = result_type()
+        c_flash_binary(z0, z1, T, P, A0, B0, C0, A1, B1, C1, out)
+        return tuple(out)
+    
+    return flash_binary
+
+
+flash_binary = _load_flash_binary()
+
+
+class FlashCalculator(flash_calculations.FlashCalculator):
+    """
+    Flash calculator whose scalar binary flashes run on the C kernel.
+    
+    Requires the compiled library; see the build command in README.md.
+    """
+    
+    _flash_binary = staticmethod(flash_binary)
+    
+    def __init__(self, components_data):
+        if flash_binary is None:
+            raise RuntimeError(f"{_LIBRARY_NAME} has not been built next to flash_ext.py")
+        super().__init__(components_data)
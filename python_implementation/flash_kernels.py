@@ -0,0 +1,162 @@
+"""
+Numerical Kernels for Flash Calculations
+
+This module contains the scalar numerical kernels behind the flash
+calculations. They are written in plain Python restricted to the subset that
+Numba can compile: flash_calculations calls them directly, while flash_numba
+wraps the same functions with @njit. Kernels must therefore not call each
+other through module globals.
+
+Author: Generated for Distillation Repository
+Date: 2024
+"""
+
+import math
+
+import numpy as np
+
+# Module-level binding avoids the math attribute lookup when the kernels run
+# as plain Python; Numba resolves it to the same intrinsic as math.exp
+_exp = math.exp
+
+
+def _flash_binary(z0, z1, T, P, A0, B0, C0, A1, B1, C1):
+    """
+    Isothermal flash of a binary mixture.
+
+    Parameters:
+    z0, z1 (float): Feed mole fractions
+    T (float): Temperature in Celsius
+    P (float): Pressure in mmHg
+    A0, B0, C0, A1, B1, C1 (float): Antoine constants, A and B pre-scaled by ln(10)
+
+    Returns:
+    tuple: (K0, K1, psi, x0, x1, y0, y1)
+    """
+    inv_P = 1.0 / P
+    K0 = _exp(A0 - B0/(T + C0)) * inv_P
+    K1 = _exp(A1 - B1/(T + C1)) * inv_P
+    a = K0 - 1.0
+    b = K1 - 1.0
+
+    # Each z*(K - 1) term is shared by both bound residuals and the root
+    za = z0 * a
+    zb = z1 * b
+    f_liquid = za + zb
+
+    # Subcooled liquid or superheated vapor: the root lies outside [0, 1]
+    if f_liquid <= 0.0:
+        psi = 0.0
+    elif za / K0 + zb / K1 >= 0.0:
+        psi = 1.0
+    else:
+        # Closed-form binary Rachford-Rice root, bracketed inside (0, 1)
+        # by the checks above
+        psi = -f_liquid / ((z0 + z1) * a * b)
+
+    x0 = z0 / (1.0 + psi * a)
+    x1 = z1 / (1.0 + psi * b)
+
+    return K0, K1, psi, x0, x1, K0 * x0, K1 * x1
+
+
+def _rr_solve(z, K, psi0, tolerance, max_iterations):
+    """
+    Isothermal flash for any number of components given K-values.
+
+    Same algorithm as flash_calculations.solve_flash_calculation (single-phase
+    checks, then bracketed Newton), written with explicit loops and scalar
+    accumulators so the compiled version allocates nothing but x and y.
+    Intended for use through flash_numba; as plain Python the NumPy solver
+    is faster.
+
+    Parameters:
+    z (array): Feed composition (float64)
+    K (array): K-values for each component (float64)
+    psi0 (float): Initial guess for vapor fraction
+    tolerance (float): Convergence tolerance on the vapor fraction
+    max_iterations (int): Maximum number of Newton iterations
+
+    Returns:
+    tuple: (vapor_fraction, liquid_composition, vapor_composition, converged),
+           where converged is False if Newton ran out of iterations
+    """
+    n = z.shape[0]
+    converged = True
+
+    # Subcooled liquid or superheated vapor: the root lies outside [0, 1]
+    f_liquid = 0.0
+    f_vapor = 0.0
+    for i in range(n):
+        a = K[i] - 1.0
+        f_liquid += z[i] * a
+        f_vapor += z[i] * a / K[i]
+
+    if f_liquid <= 0.0:
+        psi = 0.0
+    elif f_vapor >= 0.0:
+        psi = 1.0
+    else:
+        lo = 0.0
+        hi = 1.0
+        psi = psi0 if (psi0 > 0.0 and psi0 < 1.0) else 0.5
+        converged = False
+        for _ in range(max_iterations):
+            f = 0.0
+            df = 0.0
+            for i in range(n):
+                a = K[i] - 1.0
+                d = 1.0 + psi * a
+                t = z[i] * a / d
+                f += t
+                df -= t * a / d
+
+            if f > 0.0:
+                lo = psi
+            else:
+                hi = psi
+
+            psi_new = psi - f / df
+            if not (psi_new > lo and psi_new < hi):
+                psi_new = 0.5 * (lo + hi)
+
+            converged = abs(psi_new - psi) < tolerance
+            psi = psi_new
+            if converged:
+                break
+
+    x = np.empty(n)
+    y = np.empty(n)
+    for i in range(n):
+        x[i] = z[i] / (1.0 + psi * (K[i] - 1.0))
+        y[i] = K[i] * x[i]
+
+    return psi, x, y, converged
+
+
+def make_flash_multicomponent(rr_solve):
+    """
+    Build the fused multi-component flash kernel around a Rachford-Rice solver.
+
+    The solver is captured by closure, so under Numba the kernel compiles
+    with a direct call to the jitted _rr_solve rather than a second copy of
+    its Newton loop.
+
+    Parameters:
+    rr_solve (callable): _rr_solve, or its jitted version
+
+    Returns:
+    callable: flash_multicomponent(T, P, A, B, C, z, psi0, tolerance, max_iterations)
+              -> (K_values, vapor_fraction, liquid_composition, vapor_composition, converged),
+              with A and B pre-scaled by ln(10)
+    """
+    def flash_multicomponent(T, P, A, B, C, z, psi0, tolerance, max_iterations):
+        inv_P = 1.0 / P
+        K = np.empty(z.shape[0])
+        for i in range(z.shape[0]):
+            K[i] = _exp(A[i] - B[i]/(T + C[i])) * inv_P
+
+        psi, x, y, converged = rr_solve(z, K, psi0, tolerance, max_iterations)
+        return K, psi, x, y, converged
+
+    return flash_multicomponent
@@ -0,0 +1,280 @@
+"""
+Tests for the flash calculation solvers.
+
+Reference values come from the original fsolve-based implementation, at
+conditions where it converged.
+
+Run from this directory with: python -m pytest
+"""
+
+import numpy as np
+import pytest
+
+import flash_calculations as fc
+
+BENZENE_TOLUENE = {
+    'benzene': {'A': 6.90565, 'B': 1211.033, 'C': 220.79},
+    'toluene': {'A': 6.95464, 'B': 1344.8, 'C': 219.482}
+}
+
+PROPANE_BUTANE_PENTANE = {
+    'propane': {'A': 6.82973, 'B': 803.997, 'C': 246.99},
+    'butane': {'A': 6.83029, 'B': 945.906, 'C': 240.0},
+    'pentane': {'A': 6.85221, 'B': 1064.840, 'C': 232.014}
+}
+
+# (T, P, z_feed, vapor_fraction, liquid_composition, vapor_composition)
+BINARY_BASELINE = [
+    (100, 760, [0.4, 0.6], 0.72031311354363,
+     [0.25646679323961297, 0.7435332067603869], [0.4557318129395398, 0.5442681870604602]),
+    (95, 760, [0.5, 0.5], 0.43053401853923234,
+     [0.40448547714261174, 0.5955145228573883], [0.6263367565872918, 0.3736632434127082]),
+]
+
+MULTICOMPONENT_BASELINE = [
+    (10, 760, [0.3, 0.4, 0.3], 0.8750750044107394,
+     [0.0507456389647236, 0.2843022143874811, 0.6649521466477953],
+     [0.3355833497654338, 0.4165169217318279, 0.2478997285027382]),
+    (0, 760, [0.3, 0.4, 0.3], 0.5395415539370326,
+     [0.09597391069105476, 0.3959275861195592, 0.5080985031893861],
+     [0.4741210391562631, 0.4034755012907346, 0.12240345955300228]),
+    (20, 1500, [0.2, 0.5, 0.3], 0.4060536004075401,
+     [0.08418034073747997, 0.4924486234105232, 0.4233710358519968],
+     [0.36941278085444074, 0.5110456179499085, 0.11954160119565059]),
+]
+
+
+def _random_conditions(n, n_components, seed=0):
+    rng = np.random.default_rng(seed)
+    T = rng.uniform(-40, 120, n)
+    P = rng.uniform(200, 5000, n)
+    z = rng.dirichlet(np.ones(n_components), n)
+    return T, P, z
+
+
+@pytest.mark.parametrize("data, baseline", [
+    (BENZENE_TOLUENE, BINARY_BASELINE),
+    (PROPANE_BUTANE_PENTANE, MULTICOMPONENT_BASELINE),
+], ids=['binary', 'multicomponent'])
+def test_flash_matches_baseline(data, baseline):
+    flash_calc = fc.FlashCalculator(data)
+    for T, P, z, psi, x, y in baseline:
+        results = flash_calc.binary_flash(T, P, z)
+        assert results['vapor_fraction'] == pytest.approx(psi, abs=1e-10)
+        np.testing.assert_allclose(list(results['liquid_composition'].values()), x, atol=1e-10)
+        np.testing.assert_allclose(list(results['vapor_composition'].values()), y, atol=1e-10)
+
+
+@pytest.mark.parametrize("z, K", [
+    ([0.4, 0.6], [0.8, 0.5]),
+    ([0.3, 0.4, 0.3], [0.9, 0.5, 0.2]),
+], ids=['binary', 'multicomponent'])
+def test_subcooled_liquid(z, K):
+    psi, x, y = fc.solve_flash_calculation(np.array(z), np.array(K))
+    assert psi == 0.0
+    np.testing.assert_allclose(x, z)
+
+
+@pytest.mark.parametrize("z, K", [
+    ([0.4, 0.6], [3.0, 1.5]),
+    ([0.3, 0.4, 0.3], [4.0, 2.0, 1.2]),
+], ids=['binary', 'multicomponent'])
+def test_superheated_vapor(z, K):
+    psi, x, y = fc.solve_flash_calculation(np.array(z), np.array(K))
+    assert psi == 1.0
+    np.testing.assert_allclose(y, z)
+
+
+def test_single_phase_edges_in_calculators():
+    flash_calc = fc.FlashCalculator(BENZENE_TOLUENE)
+    assert flash_calc.flash(80, 760, [0.4, 0.6]).vapor_fraction == 0.0
+    assert flash_calc.flash(120, 1000, [0.3, 0.7]).vapor_fraction == 1.0
+
+    batch = flash_calc.binary_flash_batch([80, 120], [760, 1000], [[0.4, 0.6], [0.3, 0.7]])
+    np.testing.assert_array_equal(batch['vapor_fraction'], [0.0, 1.0])
+
+
+@pytest.mark.parametrize("data, z", [
+    (BENZENE_TOLUENE, [0.2, 0.3, 0.5]),
+    (BENZENE_TOLUENE, [1.0]),
+    (PROPANE_BUTANE_PENTANE, [0.4, 0.6]),
+], ids=['binary-long', 'binary-short', 'multicomponent-short'])
+def test_flash_rejects_feed_length_mismatch(data, z):
+    with pytest.raises(ValueError):
+        fc.FlashCalculator(data).flash(100, 760, z)
+
+
+def test_k_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(fc, '_K_CACHE_SIZE', 2)
+    flash_calc = fc.FlashCalculator(PROPANE_BUTANE_PENTANE)
+    K_first = flash_calc._k_at(0, 760)
+    flash_calc._k_at(10, 760)
+    assert flash_calc._k_at(0, 760) is K_first
+    flash_calc._k_at(20, 760)
+    assert list(flash_calc._k_cache) == [(0.0, 760.0), (20.0, 760.0)]
+
+
+def test_max_iterations_fallback():
+    T, P, z = _random_conditions(200, 3, seed=1)
+    flash_calc = fc.FlashCalculator(PROPANE_BUTANE_PENTANE)
+    K = flash_calc._k(T[:, None], (1.0 / P)[:, None])
+
+    # Scalar solver
+    for i in range(len(T)):
+        psi, _, _ = fc.solve_flash_calculation(z[i], K[i])
+        psi_1, _, _ = fc.solve_flash_calculation(z[i], K[i], max_iterations=1)
+        assert psi_1 == pytest.approx(psi, abs=1e-10)
+
+    # Batch solver
+    active = (np.sum(z * (K - 1), axis=1) > 0) & (np.sum(z * (K - 1) / K, axis=1) < 0)
+    assert active.any()
+    psi = fc._rr_newton_batch(z, K, active)
+    psi_1 = fc._rr_newton_batch(z, K, active, max_iterations=1)
+    np.testing.assert_allclose(psi_1[active], psi[active], atol=1e-10)
+
+
+@pytest.mark.parametrize("data", [BENZENE_TOLUENE, PROPANE_BUTANE_PENTANE],
+                         ids=['binary', 'multicomponent'])
+def test_batch_matches_scalar(data):
+    flash_calc = fc.FlashCalculator(data)
+    T, P, z = _random_conditions(300, len(data))
+    batch = flash_calc.binary_flash_batch(T, P, z)
+
+    for i in range(len(T)):
+        result = flash_calc.flash(T[i], P[i], z[i])
+        assert batch['vapor_fraction'][i] == pytest.approx(result.vapor_fraction, abs=1e-10)
+        np.testing.assert_allclose(batch['liquid_composition'][i], result.liquid_composition,
+                                   atol=1e-10)
+
+
+def _check_grid(flash_calc, z):
+    T, P = np.meshgrid(np.linspace(-20, 120, 5), np.linspace(300, 3000, 4))
+    batch = flash_calc.binary_flash_batch(T, P, z, F=50)
+
+    n = len(flash_calc.component_names)
+    assert batch['vapor_fraction'].shape == T.shape
+    assert batch['vapor_flow_molhr'].shape == T.shape
+    assert batch['liquid_composition'].shape == T.shape + (n,)
+    assert batch['K_values'].shape == T.shape + (n,)
+
+    for i, j in np.ndindex(T.shape):
+        result = flash_calc.flash(T[i, j], P[i, j], z, F=50)
+        assert batch['vapor_fraction'][i, j] == pytest.approx(result.vapor_fraction, abs=1e-10)
+        np.testing.assert_allclose(batch['vapor_composition'][i, j], result.vapor_composition,
+                                   atol=1e-10)
+
+
+@pytest.mark.parametrize("data", [BENZENE_TOLUENE, PROPANE_BUTANE_PENTANE],
+                         ids=['binary', 'multicomponent'])
+def test_batch_over_grid(data):
+    z = np.full(len(data), 1.0 / len(data))
+    _check_grid(fc.FlashCalculator(data), z)
+
+
+def _stream(composition, flow_rate, data=BENZENE_TOLUENE):
+    return {'component_data': data, 'composition': composition, 'flow_rate': flow_rate}
+
+
+@pytest.mark.parametrize("conditions", [
+    {'temperature': 100, 'pressure': 760},
+    [{'temperature': 100, 'pressure': 760}],
+    [{'temperature': 100, 'pressure': 760}, {'temperature': 95.5, 'pressure': 900},
+     {'temperature': 80, 'pressure': 760}],
+], ids=['dict', 'single', 'per-stream'])
+def test_process_streams_batch_matches_single_stream(conditions):
+    streams = [
+        _stream({'benzene': 0.4, 'toluene': 0.6}, 100),
+        _stream({'benzene': 0.5, 'toluene': 0.5}, 250.0),
+        _stream({'benzene': 0.3, 'toluene': 0.7}, 10),
+    ]
+    outlets = fc.process_streams_batch(streams, conditions)
+    assert len(outlets) == len(streams)
+
+    if isinstance(conditions, dict):
+        conditions = [conditions]
+    for i, stream in enumerate(streams):
+        expected = fc.process_stream_flash(stream, conditions[i % len(conditions)])
+        for phase in ('vapor', 'liquid'):
+            result, reference = outlets[i][phase], expected[phase]
+            assert result.keys() == reference.keys()
+            assert result['flow_rate'] == pytest.approx(reference['flow_rate'], abs=1e-10)
+            assert list(result['composition']) == list(reference['composition'])
+            np.testing.assert_allclose(list(result['composition'].values()),
+                                       list(reference['composition'].values()), atol=1e-10)
+            for key in ('flow_rate', 'temperature', 'pressure'):
+                assert type(result[key]) is type(reference[key])
+            assert result['temperature'] == reference['temperature']
+            assert result['pressure'] == reference['pressure']
+            assert result['phase'] == reference['phase']
+
+
+def test_process_streams_batch_rejects_bad_input():
+    condition = {'temperature': 100, 'pressure': 760}
+    with pytest.raises(ValueError):
+        fc.process_streams_batch([], condition)
+    with pytest.raises(ValueError):
+        fc.process_streams_batch([_stream({'toluene': 0.6, 'benzene': 0.4}, 100)], condition)
+    with pytest.raises(ValueError):
+        fc.process_streams_batch([_stream({'benzene': 0.4, 'xylene': 0.6}, 100)], condition)
+    with pytest.raises(ValueError):
+        fc.process_streams_batch([_stream({'benzene': 0.4, 'toluene': 0.6}, 100)] * 3,
+                                 [condition, condition])
+
+
+@pytest.mark.parametrize("data", [BENZENE_TOLUENE, PROPANE_BUTANE_PENTANE],
+                         ids=['binary', 'multicomponent'])
+def test_flash_numba_matches_numpy(data):
+    pytest.importorskip('numba')
+    import flash_numba
+
+    numpy_calc = fc.FlashCalculator(data)
+    numba_calc = flash_numba.FlashCalculator(data)
+    T, P, z = _random_conditions(300, len(data), seed=2)
+
+    for i in range(len(T)):
+        expected = numpy_calc.flash(T[i], P[i], z[i])
+        result = numba_calc.flash(T[i], P[i], z[i])
+        assert result.vapor_fraction == pytest.approx(expected.vapor_fraction, abs=1e-10)
+        np.testing.assert_allclose(result.liquid_composition, expected.liquid_composition,
+                                   atol=1e-10)
+        np.testing.assert_allclose(result.K_values, expected.K_values, rtol=1e-12)
+
+    # Batched binary sweeps run on the parallel compiled loop
+    expected = numpy_calc.binary_flash_batch(T, P, z[0])
+    result = numba_calc.binary_flash_batch(T, P, z[0])
+    np.testing.assert_allclose(result['vapor_fraction'], expected['vapor_fraction'], atol=1e-10)
+
+    # Grids of conditions, as for a T x P sweep
+    _check_grid(numba_calc, np.full(len(data), 1.0 / len(data)))
+
+    # Dict K-values go through the parallel Antoine ufunc
+    numba_k = flash_numba.calculate_k_values(T[0], P[0], data)
+    numpy_k = fc.calculate_k_values(T[0], P[0], data)
+    assert list(numba_k) == list(numpy_k)
+    np.testing.assert_allclose(list(numba_k.values()), list(numpy_k.values()), rtol=1e-12)
+
+    # Read-only feeds are accepted like on the NumPy path
+    z_readonly = z[0].copy()
+    z_readonly.flags.writeable = False
+    assert numba_calc.flash(T[0], P[0], z_readonly).vapor_fraction == pytest.approx(
+        numpy_calc.flash(T[0], P[0], z_readonly).vapor_fraction, abs=1e-10)
+
+
+def test_c_kernel_matches_python_kernel():
+    import flash_ext
+    import flash_kernels
+
+    if flash_ext.flash_binary is None:
+        pytest.skip("_flash_ext has not been built")
+
+    flash_calc = fc.FlashCalculator(BENZENE_TOLUENE)
+    T, P, z = _random_conditions(300, 2, seed=3)
+    for i in range(len(T)):
+        args = (z[i, 0], z[i, 1], T[i], P[i]) + flash_calc._binary_antoine
+        np.testing.assert_allclose(flash_ext.flash_binary(*args),
+                                   flash_kernels._flash_binary(*args), rtol=1e-12, atol=1e-14)
+
+    # Single-phase edges take the same branches in both kernels
+    for T, P in [(80, 760), (120, 1000)]:
+        args = (0.4, 0.6, T, P) + flash_calc._binary_antoine
+        assert flash_ext.flash_binary(*args)[2] == flash_kernels._flash_binary(*args)[2]